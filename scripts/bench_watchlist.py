@@ -0,0 +1,72 @@
+"""Throughput benchmark for WatchlistMatcher.
+
+Run from the project root:  uv run python -m scripts.bench_watchlist --terms 2000 --mb 20
+Compares throughput and hit sets of the compiled watchlist against the
+naive per-term `in` loop.
+"""
+
+import argparse
+import random
+import string
+import time
+
+from src.news_extractor.watchlist import WatchlistMatcher
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--terms", type=int, default=1000)
+parser.add_argument("--mb", type=float, default=10.0)
+parser.add_argument("--seed", type=int, default=0)
+args = parser.parse_args()
+
+rng = random.Random(args.seed)
+
+
+def word() -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))).capitalize()
+
+
+terms = list({f"{word()} {word()}" if rng.random() < 0.5 else word() for _ in range(args.terms)})
+vocab = [word() for _ in range(20000)] + terms
+
+articles = []
+size = 0
+while size < args.mb * 1_000_000:
+    content = " ".join(rng.choices(vocab, k=400))
+    articles.append({"title": "", "date": None, "content": content})
+    size += len(content.encode("utf-8"))
+news_data = {"articles": articles, "tables": []}
+mb = size / 1_000_000
+
+print(f"{len(terms)} terms, {len(articles)} articles, {mb:.1f} MB of text")
+
+for whole_words in (False, True):
+    t0 = time.perf_counter()
+    matcher = WatchlistMatcher(terms, whole_words=whole_words)
+    t_compile = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hits = matcher.match_articles(news_data)
+    t_match = time.perf_counter() - t0
+
+    print(
+        f"watchlist (whole_words={whole_words}): compile {t_compile * 1000:.1f} ms, "
+        f"match {t_match:.2f} s ({mb / t_match:.1f} MB/s, {sum(map(len, hits.values()))} hits)"
+    )
+
+# naive baseline on a sample, extrapolated to the full corpus
+sample = articles[: max(1, len(articles) // 20)]
+sample_mb = sum(len(a["content"].encode("utf-8")) for a in sample) / 1_000_000
+t0 = time.perf_counter()
+naive_hits = set()
+for i, a in enumerate(sample):
+    text = a["content"].lower()
+    naive_hits.update((t, i) for t in terms if t.lower() in text)
+t_naive = time.perf_counter() - t0
+print(f"naive `in` loop: {sample_mb / t_naive:.1f} MB/s (measured on {sample_mb:.1f} MB sample)")
+
+# recall check: the watchlist must find exactly the (term, article) pairs the naive loop does
+hits = WatchlistMatcher(terms).match_articles({"articles": sample})
+watchlist_hits = {(t, i) for t, positions in hits.items() for i, _ in positions}
+missed, extra = naive_hits - watchlist_hits, watchlist_hits - naive_hits
+print(f"hit parity with naive loop: {'OK' if not missed and not extra else 'MISMATCH'} "
+      f"({len(naive_hits)} term/article pairs, {len(missed)} missed, {len(extra)} extra)")
@@ -0,0 +1,377 @@
+"""Sharded, resumable batch processing of large PDF corpora.
+
+The workflow has three steps:
+
+1. `build_manifest` hashes every input PDF and records its page count. The
+   manifest is written once to shared storage with `write_manifest`.
+2. Each worker calls `run_shard(manifest, ledger_path, output_dir, N, M)`.
+   Documents are assigned to shards by their content hash, so every host
+   computes the same split without coordination. Claims and completions are
+   tracked in a SQLite ledger next to the outputs; a rerun skips documents
+   already marked done, retries earlier failures and picks up stale claims
+   left by crashed workers.
+3. `merge_results` folds the per-document result files into one result set.
+
+Only the standard library is used for coordination (sqlite3 does the file
+locking), so several worker processes on one host behave the same way as
+workers on several machines sharing a filesystem.
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+
+import pdfplumber
+
+from . import NewsPDFExtractor
+
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256       TEXT PRIMARY KEY,
+    path         TEXT NOT NULL,
+    pages        INTEGER NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    worker       TEXT,
+    claimed_at   REAL,
+    completed_at REAL,
+    failed_at    REAL,
+    error        TEXT
+)
+"""
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    sha256: str
+    pages: int
+
+    def shard(self, num_shards: int) -> int:
+        """Return the shard (0-based) this document belongs to out of `num_shards`."""
+        return int(self.sha256[:16], 16) % num_shards
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _count_pages(path: str) -> int:
+    # unreadable files get 0 pages here so one bad file does not abort the
+    # manifest; `_default_extract` raises for them when they are processed
+    try:
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0
+
+
+def build_manifest(
+    paths: Iterable[str], page_counter: Optional[Callable[[str], int]] = None
+) -> List[ManifestEntry]:
+    """Hash and page-count every input document.
+
+    Entries are deduplicated by content hash (the first path wins) and
+    sorted by path so the manifest is stable between runs.
+    """
+    count = page_counter or _count_pages
+    entries: Dict[str, ManifestEntry] = {}
+    for path in sorted(str(p) for p in paths):
+        sha = _file_sha256(path)
+        if sha not in entries:
+            entries[sha] = ManifestEntry(path=path, sha256=sha, pages=count(path))
+    return sorted(entries.values(), key=lambda e: e.path)
+
+
+def write_manifest(entries: List[ManifestEntry], manifest_path: str) -> None:
+    """Write the manifest as JSON, atomically replacing any previous file."""
+    tmp = f"{manifest_path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump([asdict(e) for e in entries], fh, indent=2)
+    os.replace(tmp, manifest_path)
+
+
+def read_manifest(manifest_path: str) -> List[ManifestEntry]:
+    with open(manifest_path, encoding="utf-8") as fh:
+        return [ManifestEntry(**item) for item in json.load(fh)]
+
+
+class Ledger:
+    """SQLite-backed record of which documents are claimed and completed.
+
+    Each status change runs in its own short `BEGIN IMMEDIATE` transaction so
+    concurrent workers serialize on the database lock rather than racing.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 60.0):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+        self._conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "Ledger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _write(self, sql: str, params: Iterable[Any] = ()) -> int:
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute(sql, tuple(params))
+            rowcount = cur.rowcount
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        return rowcount
+
+    def register(self, entries: Iterable[ManifestEntry]) -> None:
+        """Add manifest entries to the ledger; existing rows are left untouched."""
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.executemany(
+                "INSERT OR IGNORE INTO documents (sha256, path, pages) VALUES (?, ?, ?)",
+                [(e.sha256, e.path, e.pages) for e in entries],
+            )
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+
+    def claim(
+        self, sha256: str, worker: str, stale_after: float, retry_failed_before: Optional[float] = None
+    ) -> bool:
+        """Try to claim a document for `worker`.
+
+        Succeeds for pending documents, documents already claimed by the same
+        worker, and claims older than `stale_after` seconds. Failed documents
+        are retried if they failed before `retry_failed_before` (a timestamp),
+        or always when it is None.
+        """
+        now = time.time()
+        return (
+            self._write(
+                "UPDATE documents SET status = 'claimed', worker = ?, claimed_at = ?, error = NULL "
+                "WHERE sha256 = ? AND (status = 'pending' "
+                "OR (status = 'failed' AND (? IS NULL OR failed_at < ?)) "
+                "OR (status = 'claimed' AND (worker = ? OR claimed_at < ?)))",
+                (worker, now, sha256, retry_failed_before, retry_failed_before, worker, now - stale_after),
+            )
+            == 1
+        )
+
+    def complete(self, sha256: str, worker: str) -> bool:
+        """Mark a document done; returns False if `worker` no longer holds the claim."""
+        return (
+            self._write(
+                "UPDATE documents SET status = 'done', completed_at = ? "
+                "WHERE sha256 = ? AND worker = ? AND status = 'claimed'",
+                (time.time(), sha256, worker),
+            )
+            == 1
+        )
+
+    def fail(self, sha256: str, worker: str, error: str) -> bool:
+        """Mark a document failed; returns False if `worker` no longer holds the claim."""
+        return (
+            self._write(
+                "UPDATE documents SET status = 'failed', failed_at = ?, error = ? "
+                "WHERE sha256 = ? AND worker = ? AND status = 'claimed'",
+                (time.time(), error, sha256, worker),
+            )
+            == 1
+        )
+
+    def status(self, sha256: str) -> Optional[str]:
+        row = self._conn.execute("SELECT status FROM documents WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def summary(self) -> Dict[str, int]:
+        """Return a `status -> count` mapping over all registered documents."""
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM documents GROUP BY status")
+        return {status: count for status, count in rows}
+
+
+def _default_extract(path: str) -> dict:
+    """Extract a document, raising if the PDF cannot be read.
+
+    `NewsPDFExtractor` swallows read errors and returns empty results, which
+    would mark corrupt files done. Opening the file first lets the error
+    reach `run_shard` so the document is recorded as failed and retried.
+    """
+    with pdfplumber.open(path) as pdf:
+        if not pdf.pages:
+            raise ValueError(f"{path} has no pages")
+    return NewsPDFExtractor(path).extract()
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def shard_output_dir(output_dir: str, shard: int, num_shards: int) -> Path:
+    return Path(output_dir) / f"shard-{shard:04d}-of-{num_shards:04d}"
+
+
+def _write_result(out_dir: Path, record: dict) -> None:
+    """Write one document's record to `<sha256>.json` atomically.
+
+    The record goes to a temp file in the same directory which is then
+    renamed into place, so readers only ever see complete files and
+    concurrent workers never share a file handle.
+    """
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=f".{record['sha256']}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, out_dir / f"{record['sha256']}.json")
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def run_shard(
+    manifest: List[ManifestEntry],
+    ledger_path: str,
+    output_dir: str,
+    shard: int,
+    num_shards: int,
+    extract: Optional[Callable[[str], dict]] = None,
+    worker_id: Optional[str] = None,
+    stale_after: float = 3600.0,
+) -> Dict[str, int]:
+    """Process every unfinished document of shard `shard` out of `num_shards`.
+
+    Each result is written to its own file (see `_write_result`) before the
+    document is marked done, so a crash can at worst leave a stray temp file
+    or redo one document, never lose a result.
+    A restarted worker gets a new default `worker_id`, so documents claimed
+    before a crash are only reclaimed after `stale_after` seconds; pass the
+    old `worker_id` to pick them up immediately. A small `stale_after` also
+    steals claims from live workers, so only use it when no other worker on
+    this shard is still running.
+    Documents that failed before this run started are retried; ones that
+    another worker fails while this run is going are left alone, so
+    concurrent workers on a shard never extract the same failure twice.
+    Returns counts of documents `processed` and `failed` in this run,
+    already `done`, `failed_elsewhere` (failed by another worker during
+    this run), and still `claimed` by another worker (unfinished, or taken
+    over by another worker while this one was extracting it).
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"shard must be in [0, {num_shards}), got {shard}")
+
+    extract = extract or _default_extract
+    worker = worker_id or _default_worker_id()
+    mine = [e for e in manifest if e.shard(num_shards) == shard]
+    counts = {"processed": 0, "failed": 0, "done": 0, "failed_elsewhere": 0, "claimed": 0}
+    run_started = time.time()
+
+    out_dir = shard_output_dir(output_dir, shard, num_shards)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Ledger(ledger_path) as ledger:
+        ledger.register(mine)
+        for entry in mine:
+            if not ledger.claim(entry.sha256, worker, stale_after, retry_failed_before=run_started):
+                status = ledger.status(entry.sha256)
+                counts["done" if status == "done" else "failed_elsewhere" if status == "failed" else "claimed"] += 1
+                continue
+            try:
+                result = extract(entry.path)
+            except Exception as exc:
+                counts["failed" if ledger.fail(entry.sha256, worker, repr(exc)) else "claimed"] += 1
+                continue
+            _write_result(out_dir, {**asdict(entry), **result})
+            counts["processed" if ledger.complete(entry.sha256, worker) else "claimed"] += 1
+
+    return counts
+
+
+def merge_results(output_dir: str) -> List[dict]:
+    """Combine all per-shard outputs into one list of document records.
+
+    Records are deduplicated by `sha256` and sorted by path. Leftover temp
+    files from interrupted writes are ignored; a result file that cannot be
+    decoded raises `ValueError` rather than being dropped silently.
+    """
+    records: Dict[str, dict] = {}
+    for result_file in sorted(Path(output_dir).glob("shard-*-of-*/*.json")):
+        try:
+            with open(result_file, encoding="utf-8") as fh:
+                record = json.load(fh)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"corrupt result file {result_file}: {exc}") from exc
+        records[record["sha256"]] = record
+    return sorted(records.values(), key=lambda r: r["path"])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Sharded batch extraction of news PDFs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_manifest = sub.add_parser("manifest", help="hash and page-count input PDFs")
+    p_manifest.add_argument("manifest")
+    p_manifest.add_argument("pdfs", nargs="+")
+
+    p_work = sub.add_parser("work", help="process shard N of M")
+    p_work.add_argument("manifest")
+    p_work.add_argument("ledger")
+    p_work.add_argument("output_dir")
+    p_work.add_argument("shard", type=int)
+    p_work.add_argument("num_shards", type=int)
+    p_work.add_argument("--worker-id", help="reuse a crashed worker's id to resume its claims")
+    p_work.add_argument(
+        "--stale-after",
+        type=float,
+        default=3600.0,
+        help="seconds after which other workers' claims are reclaimed (keep large while other workers run)",
+    )
+
+    p_merge = sub.add_parser("merge", help="merge per-shard outputs into one JSON file")
+    p_merge.add_argument("output_dir")
+    p_merge.add_argument("merged")
+
+    args = parser.parse_args(argv)
+    if args.command == "manifest":
+        write_manifest(build_manifest(args.pdfs), args.manifest)
+    elif args.command == "work":
+        counts = run_shard(
+            read_manifest(args.manifest),
+            args.ledger,
+            args.output_dir,
+            args.shard,
+            args.num_shards,
+            worker_id=args.worker_id,
+            stale_after=args.stale_after,
+        )
+        print(counts)
+    else:
+        with open(args.merged, "w", encoding="utf-8") as fh:
+            json.dump(merge_results(args.output_dir), fh, ensure_ascii=False, indent=2)
+
+
+# Usage
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+from src.news_extractor.batch import (
+    Ledger,
+    build_manifest,
+    main,
+    merge_results,
+    read_manifest,
+    run_shard,
+    shard_output_dir,
+    write_manifest,
+)
+
+
+def fake_extract(path):
+    return {"articles": [{"title": path, "date": None, "content": "text"}], "tables": []}
+
+
+def _worker(manifest_path, ledger_path, output_dir, shard, num_shards):
+    run_shard(read_manifest(manifest_path), ledger_path, output_dir, shard, num_shards, extract=fake_extract)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    paths = []
+    for i in range(12):
+        p = docs / f"doc{i:02d}.pdf"
+        p.write_bytes(f"document {i}".encode())
+        paths.append(str(p))
+    return paths
+
+
+def test_build_manifest_dedupes_and_roundtrips(tmp_path, corpus):
+    dup = tmp_path / "docs" / "zz_copy.pdf"
+    dup.write_bytes(b"document 0")
+    entries = build_manifest(corpus + [str(dup)], page_counter=lambda p: 3)
+
+    assert len(entries) == 12
+    assert all(e.pages == 3 for e in entries)
+    assert [e.path for e in entries] == sorted(corpus)
+
+    manifest_path = str(tmp_path / "manifest.json")
+    write_manifest(entries, manifest_path)
+    assert read_manifest(manifest_path) == entries
+
+
+def test_shards_partition_manifest(corpus):
+    entries = build_manifest(corpus, page_counter=lambda p: 1)
+    shards = [{e.sha256 for e in entries if e.shard(4) == n} for n in range(4)]
+    assert sum(len(s) for s in shards) == len(entries)
+    assert set().union(*shards) == {e.sha256 for e in entries}
+
+
+def test_run_shard_resumes_after_failure(tmp_path, corpus):
+    entries = build_manifest(corpus, page_counter=lambda p: 1)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+    out = str(tmp_path / "out")
+    broken = entries[0].path
+
+    def flaky(path):
+        if path == broken:
+            raise RuntimeError("boom")
+        return fake_extract(path)
+
+    first = run_shard(entries, ledger_path, out, 0, 1, extract=flaky)
+    assert first == {"processed": 11, "failed": 1, "done": 0, "failed_elsewhere": 0, "claimed": 0}
+
+    second = run_shard(entries, ledger_path, out, 0, 1, extract=fake_extract)
+    assert second == {"processed": 1, "failed": 0, "done": 11, "failed_elsewhere": 0, "claimed": 0}
+
+    with Ledger(ledger_path) as ledger:
+        assert ledger.summary() == {"done": 12}
+    assert [r["path"] for r in merge_results(out)] == sorted(corpus)
+
+
+def test_corrupt_pdfs_are_recorded_as_failed(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "garbage.pdf").write_bytes(b"not a pdf at all")
+    with open(os.path.join(os.path.dirname(__file__), "..", "data", "tages-news-2111.pdf"), "rb") as fh:
+        (docs / "truncated.pdf").write_bytes(fh.read(5000))
+    entries = build_manifest([str(p) for p in docs.iterdir()])
+    ledger_path = str(tmp_path / "ledger.sqlite")
+    out = str(tmp_path / "out")
+
+    counts = run_shard(entries, ledger_path, out, 0, 1)
+
+    assert counts == {"processed": 0, "failed": 2, "done": 0, "failed_elsewhere": 0, "claimed": 0}
+    assert all(e.pages == 0 for e in entries)
+    with Ledger(ledger_path) as ledger:
+        assert ledger.summary() == {"failed": 2}
+    assert merge_results(out) == []
+
+
+def test_live_claims_are_skipped_and_stale_claims_reclaimed(tmp_path, corpus):
+    entries = build_manifest(corpus[:1], page_counter=lambda p: 1)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+    with Ledger(ledger_path) as ledger:
+        ledger.register(entries)
+        assert ledger.claim(entries[0].sha256, "other", stale_after=3600)
+
+    out = str(tmp_path / "out")
+    counts = run_shard(entries, ledger_path, out, 0, 1, extract=fake_extract, worker_id="me")
+    assert counts == {"processed": 0, "failed": 0, "done": 0, "failed_elsewhere": 0, "claimed": 1}
+
+    time.sleep(0.01)
+    counts = run_shard(entries, ledger_path, out, 0, 1, extract=fake_extract, worker_id="me", stale_after=0)
+    assert counts["processed"] == 1
+
+
+def test_failures_are_only_retried_by_later_runs(tmp_path, corpus):
+    entries = build_manifest(corpus[:1], page_counter=lambda p: 1)
+    sha = entries[0].sha256
+    with Ledger(str(tmp_path / "ledger.sqlite")) as ledger:
+        ledger.register(entries)
+        run_started = time.time()
+        assert ledger.claim(sha, "a", stale_after=3600, retry_failed_before=run_started)
+        time.sleep(0.01)
+        assert ledger.fail(sha, "a", "boom")
+
+        # a concurrent worker whose run started before the failure skips it
+        assert not ledger.claim(sha, "b", stale_after=3600, retry_failed_before=run_started)
+        # a later run retries it
+        assert ledger.claim(sha, "c", stale_after=3600, retry_failed_before=time.time())
+
+
+def test_lost_claim_is_not_counted_as_processed(tmp_path, corpus):
+    entries = build_manifest(corpus[:1], page_counter=lambda p: 1)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+
+    def stolen(path):
+        # another worker takes over the claim while this one is extracting
+        time.sleep(0.01)
+        with Ledger(ledger_path) as ledger:
+            assert ledger.claim(entries[0].sha256, "thief", stale_after=0)
+        return fake_extract(path)
+
+    counts = run_shard(entries, ledger_path, str(tmp_path / "out"), 0, 1, extract=stolen, worker_id="me")
+
+    assert counts == {"processed": 0, "failed": 0, "done": 0, "failed_elsewhere": 0, "claimed": 1}
+    with Ledger(ledger_path) as ledger:
+        assert ledger.summary() == {"claimed": 1}
+        assert not ledger.fail(entries[0].sha256, "me", "late")
+
+
+def test_cli_work_resumes_crashed_workers_claim(tmp_path, corpus, monkeypatch, capsys):
+    manifest_path = str(tmp_path / "manifest.json")
+    entries = build_manifest(corpus[:1], page_counter=lambda p: 1)
+    write_manifest(entries, manifest_path)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+    with Ledger(ledger_path) as ledger:
+        ledger.register(entries)
+        ledger.claim(entries[0].sha256, "host:123", stale_after=3600)
+
+    monkeypatch.setattr("src.news_extractor.batch._default_extract", fake_extract)
+    out = str(tmp_path / "out")
+    main(["work", manifest_path, ledger_path, out, "0", "1", "--worker-id", "host:123"])
+
+    assert "'processed': 1" in capsys.readouterr().out
+    assert [r["path"] for r in merge_results(out)] == [entries[0].path]
+
+
+def test_interrupted_write_does_not_lose_results(tmp_path, corpus):
+    entries = build_manifest(corpus[:3], page_counter=lambda p: 1)
+    out = str(tmp_path / "out")
+    out_dir = shard_output_dir(out, 0, 1)
+    out_dir.mkdir(parents=True)
+    # what a worker killed mid-write leaves behind
+    (out_dir / f".{entries[0].sha256}.crashed.tmp").write_text('{"path": "docs/d0.pdf", "sha25')
+
+    run_shard(entries, str(tmp_path / "ledger.sqlite"), out, 0, 1, extract=fake_extract)
+
+    assert [r["path"] for r in merge_results(out)] == [e.path for e in entries]
+
+
+def test_merge_results_raises_on_corrupt_file(tmp_path, corpus):
+    entries = build_manifest(corpus[:1], page_counter=lambda p: 1)
+    out = str(tmp_path / "out")
+    run_shard(entries, str(tmp_path / "ledger.sqlite"), out, 0, 1, extract=fake_extract)
+    (shard_output_dir(out, 0, 1) / f"{entries[0].sha256}.json").write_text('{"path": "docs/d0.pdf", "sha25')
+
+    with pytest.raises(ValueError):
+        merge_results(out)
+
+
+def test_run_shard_rejects_bad_shard(tmp_path):
+    with pytest.raises(ValueError):
+        run_shard([], str(tmp_path / "ledger.sqlite"), str(tmp_path), 3, 3)
+
+
+def test_multiple_worker_processes(tmp_path, corpus):
+    manifest_path = str(tmp_path / "manifest.json")
+    write_manifest(build_manifest(corpus, page_counter=lambda p: 1), manifest_path)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+    out = str(tmp_path / "out")
+
+    # two processes per shard so claims actually contend
+    procs = [
+        multiprocessing.Process(target=_worker, args=(manifest_path, ledger_path, out, shard, 3))
+        for shard in (0, 1, 2, 0, 1, 2)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    with Ledger(ledger_path) as ledger:
+        assert ledger.summary() == {"done": 12}
+    merged = merge_results(out)
+    assert [r["path"] for r in merged] == sorted(corpus)
+    assert merged[0]["articles"][0]["title"] == merged[0]["path"]
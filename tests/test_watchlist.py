@@ -0,0 +1,124 @@
+import random
+
+import pandas as pd
+import pytest
+from src.news_extractor import Article
+from src.news_extractor.watchlist import WatchlistMatcher
+
+
+@pytest.fixture
+def news_data():
+    return {
+        "articles": [
+            {"title": "A", "date": None, "content": "Berlin und Bern melden Rekorde."},
+            Article(title="B", date=None, content="Neues aus Berlin Mitte und Dortmund."),
+            {"title": "C", "date": None, "content": ""},
+        ],
+        "tables": [
+            {"page": 1, "table_index": 0, "rows": [{"Stadt": "Dortmund", "Wert": "30"}]},
+            pd.DataFrame({"col1": ["Berlin", "Hamburg"], "col2": [20, 30]}),
+            [["Munich", "40"]],
+        ],
+    }
+
+
+def test_match_articles_offsets(news_data):
+    matcher = WatchlistMatcher(["Berlin", "Bern", "Dortmund", "Stuttgart"])
+    hits = matcher.match_articles(news_data)
+
+    assert hits["Berlin"] == [(0, 0), (1, 10)]
+    assert hits["Bern"] == [(0, 11)]
+    assert hits["Dortmund"] == [(1, 27)]
+    assert "Stuttgart" not in hits
+
+
+def test_nested_terms_are_all_reported(news_data):
+    matcher = WatchlistMatcher(["Berlin", "Berlin Mitte"])
+    hits = matcher.match_articles(news_data)
+
+    assert hits["Berlin"] == [(0, 0), (1, 10)]
+    assert hits["Berlin Mitte"] == [(1, 10)]
+
+
+def test_overlapping_terms_are_all_reported():
+    assert list(WatchlistMatcher(["Merkel", "Angela Merkel"]).finditer("Angela Merkel sagte")) == [
+        ("Angela Merkel", 0),
+        ("Merkel", 7),
+    ]
+    assert list(WatchlistMatcher(["Bern", "erna"]).finditer("Berna")) == [("Bern", 0), ("erna", 1)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hits_match_naive_scan_with_overlaps(seed):
+    rng = random.Random(seed)
+    terms = list({"".join(rng.choices("ab", k=rng.randint(1, 20))) for _ in range(200)})
+    text = "".join(rng.choices("abAB", k=2000))
+    matcher = WatchlistMatcher(terms)
+
+    lowered = text.lower()
+    expected = {(t, i) for t in terms for i in range(len(text)) if lowered.startswith(t, i)}
+    assert set(matcher.finditer(text)) == expected
+    # the term set agrees with the editors' per-term `in` loop
+    assert {t for t, _ in matcher.finditer(text)} == {t for t in terms if t in lowered}
+
+
+def test_very_long_terms():
+    long_term = "".join(chr(0x4E00 + i) for i in range(3000))
+    matcher = WatchlistMatcher([long_term, long_term[:20], "y"])
+
+    assert list(matcher.finditer("y" + long_term)) == [("y", 0), (long_term[:20], 1), (long_term, 1)]
+
+
+def test_case_sensitivity():
+    text = "BERLIN und berlin"
+    assert list(WatchlistMatcher(["Berlin"]).finditer(text)) == [("Berlin", 0), ("Berlin", 11)]
+    assert list(WatchlistMatcher(["Berlin"], case_sensitive=True).finditer(text)) == []
+
+
+def test_whole_words():
+    text = "Bernd war in Bern."
+    assert list(WatchlistMatcher(["Bern"]).finditer(text)) == [("Bern", 0), ("Bern", 13)]
+    assert list(WatchlistMatcher(["Bern"], whole_words=True).finditer(text)) == [("Bern", 13)]
+
+
+def test_special_characters_are_literal():
+    matcher = WatchlistMatcher(["C++", "a.b"])
+    assert list(matcher.finditer("C++ vs axb vs a.b")) == [("C++", 0), ("a.b", 14)]
+
+
+def test_match_tables(news_data):
+    matcher = WatchlistMatcher(["dortmund", "Berlin", "Stadt", "40"])
+    hits = matcher.match_tables(news_data)
+
+    assert hits == {"dortmund": [0], "Stadt": [0], "Berlin": [1], "40": [2]}
+
+
+def test_empty_inputs(news_data):
+    assert WatchlistMatcher([]).match_articles(news_data) == {}
+    assert WatchlistMatcher(["", "Berlin"]).match_articles({}) == {}
+    assert len(WatchlistMatcher(["Berlin", "berlin", ""])) == 2
+
+
+def test_large_watchlist_matches_naive_scan():
+    terms = [f"Name{i:04d}" for i in range(1500)]
+    text = " ".join(f"Name{i:04d}" for i in range(0, 3000, 7))
+    matcher = WatchlistMatcher(terms, whole_words=True)
+
+    found = {term for term, _ in matcher.finditer(text)}
+    assert found == {t for t in terms if t in text.split()}
+
+
+def test_offsets_survive_length_changing_lowercase():
+    # "İ".lower() is two code points, so the matcher must not shift offsets
+    text = "İstanbul und Berlin"
+    assert list(WatchlistMatcher(["berlin"]).finditer(text)) == [("berlin", 13)]
+
+
+def test_terms_with_length_changing_lowercase():
+    assert list(WatchlistMatcher(["İlkay Gündoğan"]).finditer("Trainer lobt İlkay Gündoğan")) == [
+        ("İlkay Gündoğan", 13)
+    ]
+    assert list(WatchlistMatcher(["İstanbul", "Ankara"]).finditer("İstanbul, İzmir, Ankara")) == [
+        ("İstanbul", 0),
+        ("Ankara", 17),
+    ]